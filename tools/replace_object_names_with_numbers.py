@@ -13,19 +13,64 @@ Enhancements:
     * Supports optional trailing '*' in source (e.g., "Dog Hair*") by attempting
         a lookup without the asterisk if the exact form isn't found.
     * Case-sensitive exact match first; fallback match without trailing '*'.
+    * Names from the CSV translation column (e.g. get("פגיון")) are replaced
+        too, so logic files that already use translated names are handled.
+    * --strict fails without changing anything if a logic file references
+        an object name that isn't in the CSV.
+    * Logic files are matched as raw bytes, so UTF-8 and Windows-1255 files
+        are both handled without decoding them.
 """
 
 import argparse
 import csv
+import mmap
 import os
 import re
 import shutil
+import tarfile
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # optional: pip install zstandard (for --backup-format tarzst)
+
+# Encodings logic files may be saved in; object names are matched in each
+LOGIC_FILE_ENCODINGS = ('windows-1255', 'utf-8')
+
+# Logic files at least this size are memory-mapped instead of read into memory
+MMAP_MIN_SIZE = 64 * 1024
+
+# One alternative per supported command; the outer group of each alternative
+# is the last one to close, so match.lastgroup tells which command matched.
+# Each quantified class excludes the character that must follow it, so there
+# is only one way to match and an unterminated call fails in linear time.
+OBJECT_REF_RE = re.compile(
+    # get/has/drop("Name")
+    rb'\b(?P<cmd>(?P<command>get|has|drop)\s*\(\s*["\'](?P<name1>[^"\']+)["\']\s*\))'
+    # obj.in.room("Name", <rest>) - rest is the comma + rest of args until closing paren
+    rb'|\b(?P<room>obj\.in\.room\s*\(\s*["\'](?P<name2>[^"\']+)["\'](?P<rest2>\s*,[^)]*)\))'
+    # put("Name", <rest>)
+    rb'|\b(?P<put>put\s*\(\s*["\'](?P<name3>[^"\']+)["\'](?P<rest3>\s*,[^)]*)\))'
+)
+
+# Replacement format per OBJECT_REF_RE command group
+REPLACEMENT_FORMATS = {
+    'cmd': b'%(command)s(i%(number)s)',
+    'room': b'obj.in.room(i%(number)s%(rest)s)',
+    'put': b'put(i%(number)s%(rest)s)',
+}
+
 
 def load_object_mapping(csv_file):
-    """Load object name to number mapping from CSV file"""
+    """Load object name to number mapping from CSV file.
+
+    Both the source name (column 2) and, when filled in, the translated name
+    (column 3) map to the object number, so logic files that already use the
+    translated names are handled too.
+    """
     mapping = {}
+    translations = {}
     try:
         with open(csv_file, 'r', encoding='windows-1255') as f:
             reader = csv.reader(f)
@@ -42,6 +87,14 @@ def load_object_mapping(csv_file):
                         
                     mapping[name] = number
                     
+                    translation = row[2].strip() if len(row) >= 3 else ''
+                    if translation:
+                        translations[translation] = number
+        
+        # A source name wins over an identical translated name of another object
+        for name, number in translations.items():
+            mapping.setdefault(name, number)
+                    
         print(f"✅ Loaded {len(mapping)} object mappings from CSV (Windows-1255 encoding)")
         return mapping
         
@@ -50,119 +103,160 @@ def load_object_mapping(csv_file):
         return None
 
 
-def backup_src_folder(src_folder):
-    """Create backup of source folder"""
+def encode_object_mapping(object_mapping):
+    """Encode object mapping to bytes for matching undecoded logic files"""
+    mapping_bytes = {}
+    for name, number in object_mapping.items():
+        for encoding in LOGIC_FILE_ENCODINGS:
+            mapping_bytes[name.encode(encoding)] = number.encode('ascii')
+    return mapping_bytes
+
+
+def backup_src_folder(src_folder, backup_format='tree'):
+    """Create backup of source folder.
+
+    backup_format 'tree' copies the folder, 'link' hardlinks its files into
+    the backup folder and 'tarzst' writes a single zstd-compressed tarball.
+    Returns the backup path, or None on failure.
+    """
     backup_folder = src_folder.parent / "src_before_replace_objects"
-    
+    if backup_format == 'tarzst':
+        backup_folder = backup_folder.with_name(backup_folder.name + ".tar.zst")
+        if zstandard is None:
+            print("❌ Error: --backup-format tarzst requires the zstandard package")
+            print("   Install with: pip install zstandard")
+            return None
+
     if backup_folder.exists():
-        print(f"❌ Error: Backup folder '{backup_folder}' already exists!")
-        print("   Please remove or rename the existing backup folder before proceeding.")
-        return False
+        print(f"❌ Error: Backup '{backup_folder}' already exists!")
+        print("   Please remove or rename the existing backup before proceeding.")
+        return None
     
     try:
-        shutil.copytree(src_folder, backup_folder)
+        if backup_format == 'tarzst':
+            # One sequential write instead of creating a file per logic file.
+            # Restore with: tar -I zstd -xf src_before_replace_objects.tar.zst
+            with open(backup_folder, 'wb') as f, \
+                    zstandard.ZstdCompressor().stream_writer(f) as z, \
+                    tarfile.open(fileobj=z, mode='w|') as tar:
+                tar.add(src_folder, arcname=src_folder.name)
+        elif backup_format == 'link':
+            # Hardlink the files instead of copying their bytes. Files this
+            # script modifies are replaced by a new file (see write_file_atomic),
+            # but anything that later writes a file in place (editors, other
+            # tools) changes the backup too.
+            try:
+                shutil.copytree(src_folder, backup_folder, copy_function=os.link)
+            except OSError:
+                # Cross-device backup or filesystem without hardlink support
+                shutil.rmtree(backup_folder, ignore_errors=True)
+                shutil.copytree(src_folder, backup_folder)
+        else:
+            shutil.copytree(src_folder, backup_folder)
         print(f"✅ Created backup: {backup_folder}")
-        return True
+        return backup_folder
     except Exception as e:
         print(f"❌ Error creating backup: {e}")
-        return False
+        if backup_format == 'tarzst':
+            backup_folder.unlink(missing_ok=True)
+        return None
+
+
+def lookup_object_number(object_name, object_mapping):
+    """Return the object number for a name, retrying without a trailing '*'"""
+    number = object_mapping.get(object_name)
+    if number is None and object_name.endswith(b'*'):
+        number = object_mapping.get(object_name.rstrip(b'*').strip())
+    return number
 
 
 def replace_object_references(content, object_mapping):
-    """Replace object names with numbers in supported command patterns."""
+    """Replace object names with numbers in supported command patterns.
+
+    Works on raw file bytes (bytes or a buffer such as mmap); object_mapping
+    must have bytes keys and values (see encode_object_mapping).
+    """
     total_changes = 0
 
-    # 1. get/has/drop commands
-    cmd_pattern = r'\b(get|has|drop)\s*\(\s*["\']([^"\']+)["\']\s*\)'
-
-    def replace_simple(match):
-        nonlocal total_changes
-        command = match.group(1)
-        object_name = match.group(2)
-        number = object_mapping.get(object_name)
-        if number is None and object_name.endswith('*'):
-            base = object_name.rstrip('*').strip()
-            if base in object_mapping:
-                number = object_mapping[base]
-        if number is not None:
-            total_changes += 1
-            return f"{command}(i{number})"
-        return match.group(0)
-
-    content = re.sub(cmd_pattern, replace_simple, content)
-
-    # 2. obj.in.room("Name", <rest>) pattern
-    # Capture object name and the remainder (comma + rest of args until closing paren)
-    room_pattern = r'\bobj\.in\.room\s*\(\s*["\']([^"\']+)["\'](\s*,[^)]*?)\)'
-
-    def replace_room(match):
-        nonlocal total_changes
-        object_name = match.group(1)
-        remainder = match.group(2)
-        number = object_mapping.get(object_name)
-        if number is None and object_name.endswith('*'):
-            base = object_name.rstrip('*').strip()
-            if base in object_mapping:
-                number = object_mapping[base]
-        if number is not None:
-            total_changes += 1
-            return f"obj.in.room(i{number}{remainder})"
-        return match.group(0)
-
-    content = re.sub(room_pattern, replace_room, content)
-
-    # 3. put("Name", <rest>) pattern (similar to obj.in.room but without prefix)
-    put_pattern = r'\bput\s*\(\s*["\']([^"\']+)["\'](\s*,[^)]*?)\)'
-
-    def replace_put(match):
-        nonlocal total_changes
-        object_name = match.group(1)
-        remainder = match.group(2)
-        number = object_mapping.get(object_name)
-        if number is None and object_name.endswith('*'):
-            base = object_name.rstrip('*').strip()
-            if base in object_mapping:
-                number = object_mapping[base]
-        if number is not None:
-            total_changes += 1
-            return f"put(i{number}{remainder})"
-        return match.group(0)
-
-    content = re.sub(put_pattern, replace_put, content)
-
-    return content, total_changes
+    pieces = []
+    position = 0
+    for match in OBJECT_REF_RE.finditer(content):
+        object_name = match['name1'] or match['name2'] or match['name3']
+        number = lookup_object_number(object_name, object_mapping)
+        if number is None:
+            continue
+        pieces.append(content[position:match.start()])
+        pieces.append(REPLACEMENT_FORMATS[match.lastgroup] % {
+            b'command': match['command'],
+            b'number': number,
+            b'rest': match['rest2'] or match['rest3'],
+        })
+        position = match.end()
+        total_changes += 1
+
+    if not total_changes:
+        return content, total_changes
+
+    pieces.append(content[position:])
+    return b''.join(pieces), total_changes
+
+
+def find_unknown_object_names(content, object_mapping):
+    """Return the object names referenced in content that aren't in object_mapping"""
+    return [name for match in OBJECT_REF_RE.finditer(content)
+            for name in [match['name1'] or match['name2'] or match['name3']]
+            if lookup_object_number(name, object_mapping) is None]
+
+
+def decode_object_name(name):
+    """Decode a bytes object name for display"""
+    try:
+        return name.decode('utf-8')
+    except UnicodeDecodeError:
+        return name.decode('windows-1255', errors='replace')
+
+
+def check_object_names(logic_files, object_mapping):
+    """Report every referenced object name missing from the CSV.
+
+    Returns True if all names are known.
+    """
+    all_known = True
+    for logic_file in logic_files:
+        for name in find_unknown_object_names(logic_file.read_bytes(), object_mapping):
+            print(f"❌ Error: Object '{decode_object_name(name)}' not found in CSV file")
+            print(f"   File: {logic_file}")
+            all_known = False
+    return all_known
+
+
+def write_file_atomic(file_path, content):
+    """Write content to a sibling temp file and rename it over file_path"""
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def process_logic_file(file_path, object_mapping):
     """Process a single logic file"""
     try:
-        # Read file with UTF-8 first, then Windows-1255 fallback
-        content = None
-        encodings = ['utf-8', 'windows-1255', 'latin-1']
-        used_encoding = None
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                used_encoding = encoding
-                break
-            except UnicodeDecodeError:
-                continue
-        
-        if content is None:
-            print(f"⚠️  Could not read file: {file_path}")
-            return 0
-
-        # Replace object references in supported patterns
-        new_content, changes_made = replace_object_references(content, object_mapping)
+        # Read raw bytes; the file keeps its original encoding and line endings
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                # Scan large files directly from the page cache
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    new_content, changes_made = replace_object_references(content, object_mapping)
+            else:
+                new_content, changes_made = replace_object_references(f.read(), object_mapping)
 
-        # Write back if changes were made (prefer Windows-1255 for AGI files)
+        # Write back if changes were made
         if changes_made > 0:
-            write_encoding = 'windows-1255' if used_encoding in ['windows-1255', 'latin-1'] else 'utf-8'
-            with open(file_path, 'w', encoding=write_encoding) as f:
-                f.write(new_content)
-            print(f"   📝 {file_path.name}: {changes_made} replacements (encoding: {used_encoding}→{write_encoding})")
+            write_file_atomic(file_path, new_content)
+            print(f"   📝 {file_path.name}: {changes_made} replacements")
 
         return changes_made
         
@@ -171,8 +265,12 @@ def process_logic_file(file_path, object_mapping):
         return 0
 
 
-def scan_and_replace_objects(src_folder, csv_file):
-    """Main function to scan and replace object names"""
+def scan_and_replace_objects(src_folder, csv_file, backup=True, backup_format='tree', strict=False):
+    """Main function to scan and replace object names.
+
+    With strict=True, nothing is modified if any referenced object name is
+    missing from the CSV.
+    """
     src_path = Path(src_folder)
     csv_path = Path(csv_file)
     
@@ -190,16 +288,27 @@ def scan_and_replace_objects(src_folder, csv_file):
     if not object_mapping:
         return False
     
-    # Create backup
-    if not backup_src_folder(src_path):
-        return False
-    
     # Find all .lgc files
-    logic_files = list(src_path.glob("*.lgc"))
+    with os.scandir(src_path) as entries:
+        logic_files = [Path(entry.path) for entry in entries
+                       if entry.name.lower().endswith('.lgc') and entry.is_file()]
     if not logic_files:
         print(f"⚠️  No .lgc files found in {src_folder}")
         return False
     
+    mapping_bytes = encode_object_mapping(object_mapping)
+    
+    # Check names before the backup, so a failed strict run leaves nothing behind
+    if strict and not check_object_names(sorted(logic_files), mapping_bytes):
+        return False
+    
+    # Create backup
+    backup_path = None
+    if backup:
+        backup_path = backup_src_folder(src_path, backup_format)
+        if backup_path is None:
+            return False
+    
     print(f"\n🔍 Processing {len(logic_files)} logic files...")
     print("=" * 50)
     
@@ -207,7 +316,7 @@ def scan_and_replace_objects(src_folder, csv_file):
     files_modified = 0
     
     for logic_file in sorted(logic_files):
-        changes = process_logic_file(logic_file, object_mapping)
+        changes = process_logic_file(logic_file, mapping_bytes)
         total_changes += changes
         if changes > 0:
             files_modified += 1
@@ -218,7 +327,8 @@ def scan_and_replace_objects(src_folder, csv_file):
     print(f"   Files processed: {len(logic_files)}")
     print(f"   Files modified: {files_modified}")
     print(f"   Total replacements: {total_changes}")
-    print(f"   Backup created: {src_path.parent}/src_before_replace_objects")
+    if backup_path:
+        print(f"   Backup created: {backup_path}")
     
     if total_changes > 0:
         print(f"\n✅ Object replacement completed successfully!")
@@ -237,6 +347,14 @@ def main():
     )
     parser.add_argument("src_folder", help="Source folder containing .lgc files")
     parser.add_argument("csv_file", help="CSV file with object number/name mapping")
+    parser.add_argument("--no-backup", action="store_true",
+                        help="Don't create the src_before_replace_objects backup (files are still replaced atomically)")
+    parser.add_argument("--backup-format", choices=["tree", "link", "tarzst"], default="tree",
+                        help="Backup as a copied folder, as a folder of hardlinks (fast, but in-place edits "
+                             "of unchanged files also change the backup) or as a single zstd-compressed "
+                             "tarball (requires zstandard)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Fail without changing anything if a logic file references an object name missing from the CSV")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be changed without making changes")
     
     args = parser.parse_args()
@@ -251,7 +369,8 @@ def main():
         print("⚠️  Dry run mode not implemented yet")
         return
     
-    success = scan_and_replace_objects(args.src_folder, args.csv_file)
+    success = scan_and_replace_objects(args.src_folder, args.csv_file, backup=not args.no_backup,
+                                       backup_format=args.backup_format, strict=args.strict)
     
     if not success:
         exit(1)
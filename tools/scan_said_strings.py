@@ -9,94 +9,141 @@ Can output in different formats:
 
 Notes:
 - Scans only the specified folder (non-recursive).
+- A said() call must be on a single line; calls split across lines are skipped.
+- Files can be scanned in parallel with --jobs N (worth it only for large folders).
 - Strings are unescaped for common sequences (\" -> ", \\ -> \\ , \n -> newline).
 """
 from __future__ import annotations
 
 import argparse
+import os
 import re
 import json
+import mmap
+import sys
+from collections import defaultdict
+from contextlib import nullcontext
+from multiprocessing import Pool
 from pathlib import Path
 from typing import List, Set
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional: pip install orjson (faster JSON output)
+
 
 # Regex for said("arg1")(, "arg2")?(, "arg3")?
+# A call must fit on one line, as when files were scanned line by line:
+# strings and the whitespace between args may not contain a line break.
+# Each string is "unrolled" (plain run, then escape + plain run, ...), and each
+# quantified class excludes what may follow it, so there is only one way to
+# match it and unterminated strings fail in linear time.
+# The pattern is matched against raw file bytes; only the captured args are decoded.
+SAID_WS = rb"[^\S\r\n]*"  # whitespace other than line breaks
+SAID_ARG = rb"([^\"\\\r\n]*(?:\\.[^\"\\\r\n]*)*)"
 SAID_RE = re.compile(
-    r"said\s*\(\s*\""  # opening quote for arg1
-    r"((?:[^\"\\]|\\.)*)"  # arg1 in group 1
-    r"\""  # closing quote for arg1
-    r"(?:\s*,\s*\"((?:[^\"\\]|\\.)*)\")?"  # optional arg2 in group 2
-    r"(?:\s*,\s*\"((?:[^\"\\]|\\.)*)\")?"  # optional arg3 in group 3
-    r"\s*\)",
+    rb"said" + SAID_WS + rb"\(" + SAID_WS + rb"\""  # opening quote for arg1
+    + SAID_ARG +  # arg1 in group 1
+    rb"\""  # closing quote for arg1
+    rb"(?:" + SAID_WS + rb"," + SAID_WS + rb"\"" + SAID_ARG + rb"\")?"  # optional arg2 in group 2
+    rb"(?:" + SAID_WS + rb"," + SAID_WS + rb"\"" + SAID_ARG + rb"\")?"  # optional arg3 in group 3
+    + SAID_WS + rb"\)",
     re.IGNORECASE,
 )
 
+# Escape sequences handled by unescape(), keyed by the character after the backslash
+ESCAPE_RE = re.compile(r"\\([\"\\ntr])")
+ESCAPE_CHARS = {'"': '"', "\\": "\\", "n": "\n", "t": "\t", "r": "\r"}
+
+# A said() call is keyed by its args joined with TOKEN_SEP: a single short string
+# hashes and compares faster than a tuple. NUL sorts before any character that
+# can appear in an arg, so sorted keys are in the same order as sorted tuples.
+TOKEN_SEP = "\x00"
+
+# Logic files at least this size are memory-mapped instead of read into memory
+MMAP_MIN_SIZE = 64 * 1024
+
+# Tokens (lowercased) left out of the text output format
+TEXT_SKIPPED_TOKENS = frozenset({"anyword"})
+
+# Logic file name: LogicXXX.lgc where XXX is the room number
+LOGIC_FILENAME_RE = re.compile(r"Logic(\d+)\.lgc", re.IGNORECASE)
+
 
 def unescape(s: str) -> str:
     """Unescape common C-style sequences inside LGC strings.
     Currently supports: \", \\, \n, \t, \r.
     """
-    # Replace escaped sequences
-    s = s.replace(r"\"", '"')
-    s = s.replace(r"\\", "\\")
-    s = s.replace(r"\n", "\n")
-    s = s.replace(r"\t", "\t")
-    s = s.replace(r"\r", "\r")
-    return s
+    # Most said() words contain no escapes at all
+    if "\\" not in s:
+        return s
+    # Replace all escaped sequences in a single pass
+    return ESCAPE_RE.sub(lambda m: ESCAPE_CHARS[m.group(1)], s)
+
+
+def decode_arg(arg: bytes) -> str:
+    """Decode and unescape a said() argument."""
+    return unescape(arg.decode("utf-8", errors="ignore"))
 
 
 def extract_room_number(filename: str) -> int:
     """Extract room number from Logic file name (e.g., Logic83.lgc -> 83)."""
-    # Match pattern LogicXXX.lgc where XXX is the room number
-    match = re.match(r"Logic(\d+)\.lgc", filename, re.IGNORECASE)
+    match = LOGIC_FILENAME_RE.match(filename)
     if match:
         return int(match.group(1))
     return -1  # Unknown room
 
 
-def scan_file(path: Path, acc: set[tuple[str, ...]], room_acc: dict[tuple[str, ...], set[int]]):
-    """Scan a single file for said() calls and add tokens to accumulator with room tracking."""
-    room_number = extract_room_number(path.name)
+def extract_said_tokens(data) -> set[str]:
+    """Extract said() token keys (args joined with TOKEN_SEP) from raw file bytes
+    (bytes or a buffer such as mmap)."""
+    tokens: set[str] = set()
     
-    # Read with tolerant decoding
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line_num, line in enumerate(f, 1):
-            for m in SAID_RE.finditer(line):
-                a1 = unescape(m.group(1) or "")
-                a2 = m.group(2)
-                a3 = m.group(3)
-                parts = [a1]
-                if a2 is not None:
-                    parts.append(unescape(a2))
-                if a3 is not None:
-                    parts.append(unescape(a3))
-                
-                token_tuple = tuple(parts)
-                acc.add(token_tuple)
-                
-                # Track which rooms contain this said() call
-                if token_tuple not in room_acc:
-                    room_acc[token_tuple] = set()
-                room_acc[token_tuple].add(room_number)
+    # Scan the raw bytes in one pass; decode only the matched args
+    for m in SAID_RE.finditer(data):
+        a1 = decode_arg(m.group(1))
+        a2 = m.group(2)
+        a3 = m.group(3)
+        parts = [a1]
+        if a2 is not None:
+            parts.append(decode_arg(a2))
+        if a3 is not None:
+            parts.append(decode_arg(a3))
+        
+        # The said() vocabulary is small and repeats across files, so keys are
+        # interned: equal keys share one string object and compare by identity
+        tokens.add(sys.intern(TOKEN_SEP.join(parts)))
 
+    return tokens
 
-def output_as_list(tokens: set[tuple[str, ...]]) -> List[List[str]]:
-    """Convert set of tuples to list of lists format."""
-    return [list(parts) for parts in sorted(tokens)]
 
+def scan_file(path: Path) -> tuple[int, set[str]]:
+    """Scan a single file for said() calls.
 
-def output_as_pipe(tokens: set[tuple[str, ...]]) -> List[str]:
-    """Convert set of tuples to pipe-separated format."""
-    return ["|".join(parts) for parts in sorted(tokens)]
+    Returns the room number of the file and the set of said() token keys
+    (args joined with TOKEN_SEP) found in it.
+    """
+    room_number = extract_room_number(path.name)
+    
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            # Scan large files directly from the page cache
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                tokens = extract_said_tokens(data)
+        else:
+            tokens = extract_said_tokens(f.read())
 
+    return room_number, tokens
 
-def save_tokens_to_file(tokens: List[List[str]], room_acc: dict[tuple[str, ...], set[int]], output_file: str, format_type: str = "json"):
+
+def save_tokens_to_file(tokens: List[str], room_sorted: dict[str, List[int]], output_file: str, format_type: str = "json"):
     """
     Save said tokens to a file.
     
     Args:
-        tokens: List of token lists
-        room_acc: Dictionary mapping token tuples to sets of room numbers
+        tokens: Sorted list of token keys (said() args joined with TOKEN_SEP)
+        room_sorted: Dictionary mapping token keys to sorted lists of room numbers
         output_file: Output file path
         format_type: Output format ("json", "python", "text", or "csv")
     """
@@ -112,74 +159,67 @@ def save_tokens_to_file(tokens: List[List[str]], room_acc: dict[tuple[str, ...],
                 unique_tokens = {}
                 total_entries = 0
                 
-                for token_list in tokens:
-                    token_tuple = tuple(token_list)
-                    rooms = room_acc.get(token_tuple, {-1})
-                    said_tokens = " ".join(token_list)  # Space-separated tokens
+                for key in tokens:
+                    rooms = room_sorted.get(key, [-1])
+                    said_tokens = key.replace(TOKEN_SEP, " ")  # Space-separated tokens
                     
-                    for room in sorted(rooms):
-                        total_entries += 1
-                        # Only keep the first occurrence of each said_tokens (with lowest room number)
-                        if said_tokens not in unique_tokens:
-                            unique_tokens[said_tokens] = room
-                
-                # Convert to list and sort by room number first, then by said tokens
-                csv_rows = [(room, said_tokens) for said_tokens, room in unique_tokens.items()]
-                csv_rows.sort(key=lambda x: (x[0], x[1]))  # Sort by room number first, then said_tokens
+                    total_entries += len(rooms)
+                    # Only keep the first occurrence of each said_tokens (with lowest room number)
+                    if said_tokens not in unique_tokens:
+                        unique_tokens[said_tokens] = rooms[0]
                 
                 # Print deduplication info
-                unique_entries = len(csv_rows)
+                unique_entries = len(unique_tokens)
                 if total_entries != unique_entries:
                     print(f"📊 Token deduplication: {total_entries} total entries → {unique_entries} unique said_tokens ({total_entries - unique_entries} duplicates removed)")
                 
-                # Write sorted unique rows
-                for room, said_tokens in csv_rows:
-                    writer.writerow([room, said_tokens])
+                # Write unique rows sorted by room number first, then by said tokens
+                writer.writerows(sorted((room, said_tokens) for said_tokens, room in unique_tokens.items()))
                         
             elif format_type.lower() == "json":
                 # Enhanced JSON with room information
                 result = []
-                for token_list in tokens:
-                    token_tuple = tuple(token_list)
-                    rooms = sorted(list(room_acc.get(token_tuple, {-1})))
+                for key in tokens:
+                    rooms = room_sorted.get(key, [-1])
                     result.append({
-                        "tokens": token_list,
+                        "tokens": key.split(TOKEN_SEP),
                         "rooms": rooms
                     })
-                json.dump(result, outfile, indent=2, ensure_ascii=False)
+                if orjson is not None:
+                    # Same layout as json.dump(indent=2, ensure_ascii=False), serialized in C
+                    outfile.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+                else:
+                    json.dump(result, outfile, indent=2, ensure_ascii=False)
                 
             elif format_type.lower() == "python":
                 outfile.write("# Said tokens with room information\n")
                 outfile.write("said_tokens = [\n")
-                for token_list in tokens:
-                    token_tuple = tuple(token_list)
-                    rooms = sorted(list(room_acc.get(token_tuple, {-1})))
-                    token_str = "[" + ", ".join(f'"{token}"' for token in token_list) + "]"
+                for key in tokens:
+                    rooms = room_sorted.get(key, [-1])
+                    token_str = "[" + ", ".join(f'"{token}"' for token in key.split(TOKEN_SEP)) + "]"
                     outfile.write(f"    {{'tokens': {token_str}, 'rooms': {rooms}}},\n")
                 outfile.write("]\n")
                 
             else:  # text format with room numbers
                 seen_sentences = set()
-                for token_list in tokens:
-                    token_tuple = tuple(token_list)
-                    rooms = sorted(list(room_acc.get(token_tuple, {-1})))
-                    
+                for key in tokens:
                     # Filter out "anyword" from the token list
-                    filtered_tokens = [token for token in token_list if token.lower() != "anyword"]
+                    filtered_tokens = [token for token in key.split(TOKEN_SEP) if token.lower() not in TEXT_SKIPPED_TOKENS]
                     
                     # Skip empty lists after filtering
                     if not filtered_tokens:
                         continue
                     
-                    # Create space-separated sentence with room info
+                    # Only write if we haven't seen this sentence before
                     sentence = " ".join(filtered_tokens)
-                    room_info = f"(rooms: {', '.join(str(r) for r in rooms)})"
-                    full_line = f"{sentence} {room_info}"
+                    if sentence in seen_sentences:
+                        continue
+                    seen_sentences.add(sentence)
                     
-                    # Only write if we haven't seen this sentence before
-                    if sentence not in seen_sentences:
-                        seen_sentences.add(sentence)
-                        outfile.write(full_line + "\n")
+                    # Write space-separated sentence with room info
+                    rooms = room_sorted.get(key, [-1])
+                    room_info = f"(rooms: {', '.join(str(r) for r in rooms)})"
+                    outfile.write(f"{sentence} {room_info}\n")
         
         print(f"Said tokens saved to: {output_file}")
         
@@ -187,7 +227,7 @@ def save_tokens_to_file(tokens: List[List[str]], room_acc: dict[tuple[str, ...],
         print(f"Error saving tokens: {str(e)}")
 
 
-def print_statistics(tokens: List[List[str]], room_acc: dict[tuple[str, ...], set[int]]):
+def print_statistics(tokens: List[str], room_sorted: dict[str, List[int]]):
     """Print statistics about the extracted said tokens."""
     if not tokens:
         print("No said tokens found.")
@@ -202,14 +242,14 @@ def print_statistics(tokens: List[List[str]], room_acc: dict[tuple[str, ...], se
     all_words = set()
     all_rooms = set()
     
-    for token_list in tokens:
-        param_count = len(token_list)
+    for key in tokens:
+        token_parts = key.split(TOKEN_SEP)
+        param_count = len(token_parts)
         param_counts[param_count] = param_counts.get(param_count, 0) + 1
-        all_words.update(token_list)
+        all_words.update(token_parts)
         
         # Add rooms for this token
-        token_tuple = tuple(token_list)
-        rooms = room_acc.get(token_tuple, set())
+        rooms = room_sorted.get(key, [])
         all_rooms.update(rooms)
     
     print("Said calls by parameter count:")
@@ -241,6 +281,8 @@ def main() -> None:
                    help="Output format: json, python, text, pipe, csv, or list (default: list)")
     ap.add_argument("--stats", "-s", action="store_true", help="Show statistics about extracted tokens")
     ap.add_argument("--verbose", "-v", action="store_true", help="Show verbose output")
+    ap.add_argument("--jobs", "-j", type=int, default=1,
+                   help="Number of worker processes used to scan files (default: 1)")
     # Non-recursive by design
     args = ap.parse_args()
 
@@ -248,60 +290,69 @@ def main() -> None:
     if not folder.exists() or not folder.is_dir():
         raise SystemExit(f"Folder not found or not a directory: {folder}")
 
-    files = sorted(p for p in folder.glob("*.lgc") if p.is_file())
+    with os.scandir(folder) as entries:
+        files = sorted(Path(entry.path) for entry in entries
+                       if entry.name.lower().endswith(".lgc") and entry.is_file())
     
     if args.verbose:
         print(f"Scanning {len(files)} .lgc files in {folder}")
 
-    acc: set[tuple[str, ...]] = set()
-    room_acc: dict[tuple[str, ...], set[int]] = {}
+    acc: set[str] = set()
+    room_acc: defaultdict[str, set[int]] = defaultdict(set)
     
-    for path in files:
-        if args.verbose:
-            print(f"Processing: {path.name}")
-        scan_file(path, acc, room_acc)
+    # Files are independent, so large folders can be scanned by a process pool
+    with Pool(args.jobs) if args.jobs > 1 else nullcontext() as pool:
+        results = pool.imap(scan_file, files, chunksize=8) if pool else map(scan_file, files)
+        for path, (room_number, tokens) in zip(files, results):
+            if args.verbose:
+                print(f"Processing: {path.name}")
+            acc |= tokens
+            # Track which rooms contain each said() call
+            for key in tokens:
+                room_acc[key].add(room_number)
 
     if not acc:
         print("No said() tokens found in the specified directory.")
         return
 
+    # Sort the rooms of each said() call once for all output formats
+    room_sorted = {key: sorted(rooms) for key, rooms in room_acc.items()}
+
     # Convert to desired format
     if args.format == 'pipe':
         # Original pipe-separated format with room info
-        for token_tuple in sorted(acc):
-            rooms = sorted(list(room_acc.get(token_tuple, {-1})))
-            token_str = "|".join(token_tuple)
+        for key in sorted(acc):
+            rooms = room_sorted.get(key, [-1])
+            token_str = key.replace(TOKEN_SEP, "|")
             room_str = ",".join(str(r) for r in rooms)
             print(f"{token_str} (rooms: {room_str})")
     else:
-        # List of lists format
-        token_lists = output_as_list(acc)
+        # Sorted token keys, shared by all output formats
+        token_keys = sorted(acc)
         
         if args.format == 'list' and not args.output:
             # Print as Python list format to console with room info
             print("# Said tokens with room information")
-            for token_list in token_lists:
-                token_tuple = tuple(token_list)
-                rooms = sorted(list(room_acc.get(token_tuple, {-1})))
-                print(f"{token_list} -> rooms: {rooms}")
+            for key in token_keys:
+                rooms = room_sorted.get(key, [-1])
+                print(f"{key.split(TOKEN_SEP)} -> rooms: {rooms}")
         elif not args.output:
             # Print sample to console with room info
-            print(f"Found {len(token_lists)} unique said() token combinations:")
-            for i, tokens in enumerate(token_lists[:10]):
-                token_tuple = tuple(tokens)
-                rooms = sorted(list(room_acc.get(token_tuple, {-1})))
+            print(f"Found {len(token_keys)} unique said() token combinations:")
+            for i, key in enumerate(token_keys[:10]):
+                rooms = room_sorted.get(key, [-1])
                 room_str = ", ".join(str(r) for r in rooms)
-                print(f"{i+1:3}: {tokens} (rooms: {room_str})")
-            if len(token_lists) > 10:
-                print(f"... and {len(token_lists) - 10} more")
+                print(f"{i+1:3}: {key.split(TOKEN_SEP)} (rooms: {room_str})")
+            if len(token_keys) > 10:
+                print(f"... and {len(token_keys) - 10} more")
         
         # Save to file if requested
         if args.output:
-            save_tokens_to_file(token_lists, room_acc, args.output, args.format)
+            save_tokens_to_file(token_keys, room_sorted, args.output, args.format)
         
         # Show statistics if requested
         if args.stats:
-            print_statistics(token_lists, room_acc)
+            print_statistics(token_keys, room_sorted)
 
 
 if __name__ == "__main__":
@@ -6,15 +6,23 @@ Reports words that appear multiple times with different indices
 
 import argparse
 import os
+import re
 import sys
 from collections import defaultdict
 
+# Well-formed entry: word\0index
+ENTRY_RE = re.compile(r'([^\0]*)\0(\d+)')
+
 def scan_words_extended_for_duplicates(words_extended_path):
-    """Scan WORDS.TOK.EXTENDED file for duplicate words"""
+    """Scan WORDS.TOK.EXTENDED file for duplicate words.
+
+    Returns (success, word_occurrences) where word_occurrences maps each word
+    to its [(index, line_number), ...] entries.
+    """
     
     if not os.path.exists(words_extended_path):
         print(f"❌ Error: File '{words_extended_path}' not found")
-        return False
+        return False, {}
     
     print(f"🔍 Scanning WORDS.TOK.EXTENDED file: {words_extended_path}")
     print("=" * 60)
@@ -26,23 +34,27 @@ def scan_words_extended_for_duplicates(words_extended_path):
     try:
         # Try multiple encodings for AGI files
         encodings = ['Windows-1255']
-        lines = None
+        content = None
         
         for encoding in encodings:
             try:
                 with open(words_extended_path, 'r', encoding=encoding) as f:
-                    lines = f.readlines()
+                    content = f.read()
                 print(f"✅ Successfully read file using {encoding} encoding")
                 break
             except UnicodeDecodeError:
                 continue
         
-        if lines is None:
+        if content is None:
             # Fallback to binary mode
             with open(words_extended_path, 'rb') as f:
-                content = f.read().decode('latin-1', errors='replace')
-                lines = content.splitlines(keepends=True)
+                lines = f.read().decode('latin-1', errors='replace').splitlines()
             print("✅ Read file in binary mode with latin-1 fallback")
+        else:
+            # Text mode already normalized line endings to '\n'
+            lines = content.split('\n')
+            if lines[-1] == '':
+                lines.pop()
         
         for line_num, line in enumerate(lines, 1):
             line = line.strip()
@@ -53,7 +65,11 @@ def scan_words_extended_for_duplicates(words_extended_path):
                 continue
             
             # Parse word entry: word\0index
-            if '\0' in line:
+            match = ENTRY_RE.fullmatch(line)
+            if match:
+                word_occurrences[match.group(1)].append((int(match.group(2)), line_num))
+                total_words += 1
+            elif '\0' in line:
                 parts = line.split('\0')
                 if len(parts) == 2:
                     word = parts[0]
@@ -70,7 +86,7 @@ def scan_words_extended_for_duplicates(words_extended_path):
     
     except Exception as e:
         print(f"❌ Error reading file: {e}")
-        return False
+        return False, {}
     
     # Find duplicates
     duplicates_found = 0
@@ -123,7 +139,7 @@ def scan_words_extended_for_duplicates(words_extended_path):
     print(f"\n🔍 Pattern Analysis:")
     
     # Hebrew words with prefixes
-    hebrew_words = [word for word in word_occurrences.keys() if any(ord(c) > 127 for c in word)]
+    hebrew_words = [word for word in word_occurrences.keys() if not word.isascii()]
     print(f"   Hebrew words: {len(hebrew_words)}")
     
     # Words with Hebrew prefixes
@@ -134,7 +150,7 @@ def scan_words_extended_for_duplicates(words_extended_path):
     english_words = [word for word in word_occurrences.keys() if word.isascii()]
     print(f"   English words: {len(english_words)}")
     
-    return duplicates_found == 0
+    return duplicates_found == 0, word_occurrences
 
 def main():
     parser = argparse.ArgumentParser(
@@ -147,26 +163,10 @@ def main():
     
     args = parser.parse_args()
     
-    success = scan_words_extended_for_duplicates(args.words_extended_path)
+    success, word_occurrences = scan_words_extended_for_duplicates(args.words_extended_path)
     
     if args.verbose:
         print(f"\n📋 Detailed word list:")
-        word_occurrences = defaultdict(list)
-        
-        with open(args.words_extended_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line.startswith('WORDS.TOK:') or not line:
-                    continue
-                if '\0' in line:
-                    parts = line.split('\0')
-                    if len(parts) == 2:
-                        word = parts[0]
-                        try:
-                            index = int(parts[1])
-                            word_occurrences[word].append((index, line_num))
-                        except ValueError:
-                            pass
         
         for word in sorted(word_occurrences.keys()):
             occurrences = word_occurrences[word]
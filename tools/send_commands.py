@@ -6,166 +6,253 @@ More reliable than PowerShell SendKeys, especially for Hebrew text and special k
 """
 
 import argparse
+import re
 import time
 import sys
 from pathlib import Path
-from pynput.keyboard import Key, Controller
 
-keyboard = Controller()
-try:
-    import pyautogui
-    import psutil
-    import pygetwindow as gw
-except ImportError as e:
-    print(f"Missing required package: {e}")
-    print("Install with: pip install pyautogui psutil pygetwindow")
-    sys.exit(1)
+# GUI automation packages are slow to import, so they are imported on first
+# use (see import_window_module / import_gui_modules); --help and --dry-run
+# don't need them
+gw = None
+pyautogui = None
+Key = None
+keyboard = None
 
-# Configure pyautogui
-pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
-pyautogui.PAUSE = 0.1      # Default pause between actions
+def import_window_module():
+    """Import pygetwindow on first use."""
+    global gw
+    if gw is not None:
+        return
+    try:
+        import pygetwindow as gw
+    except ImportError as e:
+        print(f"Missing required package: {e}")
+        print("Install with: pip install pygetwindow")
+        sys.exit(1)
+
+def import_gui_modules():
+    """Import the window and keyboard automation packages on first use."""
+    global pyautogui, Key, keyboard
+    import_window_module()
+    if keyboard is not None:
+        return
+    try:
+        import pyautogui
+        import psutil
+        from pynput.keyboard import Key, Controller
+    except ImportError as e:
+        print(f"Missing required package: {e}")
+        print("Install with: pip install pynput pyautogui psutil pygetwindow")
+        sys.exit(1)
+    
+    # Configure pyautogui
+    pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
+    pyautogui.PAUSE = 0        # Cadence is set by --char-interval and --key-delay
+    
+    SPECIAL_KEYS.update({name: getattr(Key, attr) for name, attr in SPECIAL_KEY_NAMES.items()})
+    keyboard = Controller()
+
+# On Windows, Hebrew runs are sent with one SendInput call per run instead of
+# pynput's one call per character
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG),
+                    ('mouseData', wintypes.DWORD), ('dwFlags', wintypes.DWORD),
+                    ('time', wintypes.DWORD), ('dwExtraInfo', ctypes.c_size_t)]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [('wVk', wintypes.WORD), ('wScan', wintypes.WORD),
+                    ('dwFlags', wintypes.DWORD), ('time', wintypes.DWORD),
+                    ('dwExtraInfo', ctypes.c_size_t)]
+
+    class INPUT(ctypes.Structure):
+        # MOUSEINPUT is the largest union member, so it sets sizeof(INPUT)
+        class _INPUT(ctypes.Union):
+            _fields_ = [('mi', MOUSEINPUT), ('ki', KEYBDINPUT)]
+        _anonymous_ = ('_input',)
+        _fields_ = [('type', wintypes.DWORD), ('_input', _INPUT)]
+
+    user32 = ctypes.WinDLL('user32', use_last_error=True)
+    user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    user32.SendInput.restype = wintypes.UINT
+
+    def send_unicode_input(text):
+        """Type text as Unicode key down/up events in a single SendInput call."""
+        units = memoryview(text.encode('utf-16-le')).cast('H')
+        inputs = (INPUT * (2 * len(units)))()
+        for i, unit in enumerate(units):
+            for inp, flags in ((inputs[2*i], KEYEVENTF_UNICODE),
+                               (inputs[2*i + 1], KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)):
+                inp.type = INPUT_KEYBOARD
+                inp.ki.wScan = unit
+                inp.ki.dwFlags = flags
+        sent = user32.SendInput(len(inputs), inputs, ctypes.sizeof(INPUT))
+        if sent != len(inputs):
+            raise ctypes.WinError(ctypes.get_last_error())
+else:
+    send_unicode_input = None
+
+# A command is a sequence of {KEY} tokens and literal text; a '{' with no
+# closing '}' is literal text
+COMMAND_TOKEN_RE = re.compile(r'\{([^}]*)\}|([^{]+|\{[^{]*)')
+# Maximal runs of Hebrew (group 1) / non-Hebrew (group 2) characters
+TEXT_RUN_RE = re.compile(r'([\u0590-\u05FF]+)|([^\u0590-\u05FF]+)')
+
+# Special key names (upper case) -> pynput Key attribute names
+SPECIAL_KEY_NAMES = {
+    'ENTER': 'enter',
+    'RETURN': 'enter',
+    'ESC': 'esc',
+    'ESCAPE': 'esc',
+    'TAB': 'tab',
+    'SPACE': 'space',
+    'BACKSPACE': 'backspace',
+    'DELETE': 'delete',
+    'HOME': 'home',
+    'END': 'end',
+    'PGUP': 'page_up',
+    'PGDN': 'page_down',
+    'UP': 'up',
+    'DOWN': 'down',
+    'LEFT': 'left',
+    'RIGHT': 'right',
+}
+SPECIAL_KEY_NAMES.update({f'F{n}': f'f{n}' for n in range(1, 13)})
+
+# Special key names (upper case) -> pynput keys, filled in by import_gui_modules()
+SPECIAL_KEYS = {}
 
 def find_window_by_title(title_fragment):
     """Find windows containing the title fragment (case-insensitive)."""
     windows = []
+    fragment = title_fragment.lower()
     try:
-        all_windows = gw.getAllWindows()
-        for window in all_windows:
-            if window.title and title_fragment.lower() in window.title.lower():
-                windows.append(window)
+        windows = [window for window in gw.getAllWindows()
+                   if window.title and fragment in window.title.lower()]
     except Exception as e:
         print(f"Error finding windows: {e}")
     return windows
 
-def activate_window(window):
+def is_active_window(window):
+    """Check whether window currently has the focus."""
+    try:
+        return gw.getActiveWindow() == window
+    except Exception:
+        return False
+
+def activate_window(window, timeout=0.2, poll_interval=0.02):
     """Bring window to foreground and ensure it's active."""
     try:
         if window.isMinimized:
             window.restore()
         window.activate()
-        time.sleep(0.2)  # Wait for activation
+        # Wait for activation, but no longer than it actually takes
+        deadline = time.monotonic() + timeout
+        while not is_active_window(window) and time.monotonic() < deadline:
+            time.sleep(poll_interval)
         return True
     except Exception as e:
         print(f"Error activating window: {e}")
         return False
 
-def is_hebrew_char(char):
-    """Check if character is Hebrew."""
-    return 0x0590 <= ord(char) <= 0x05FF
+def tokenize_command(cmd):
+    """
+    Split a command into ('hebrew', str), ('text', str) and ('key', NAME) tokens.
+
+    A '{' without a matching '}' is kept as literal text.
+    """
+    tokens = []
+    for key, text in (m.groups() for m in COMMAND_TOKEN_RE.finditer(cmd)):
+        if key is not None:
+            tokens.append(('key', key.upper()))
+        else:
+            tokens.extend(('hebrew', hebrew) if hebrew else ('text', other)
+                          for hebrew, other in TEXT_RUN_RE.findall(text))
+    return tokens
+
+def send_text_safe(text, hebrew, debug=False, char_interval=0.0):
+    """
+    Send a run of Hebrew or non-Hebrew text using the most appropriate method.
 
-def send_char_safe(char, debug=False):
-    """Send a character using the most appropriate method."""
+    With char_interval > 0 the run is typed one character at a time, sleeping
+    char_interval seconds between characters.
+    """
     try:
-        if is_hebrew_char(char):
-            # Use pynput for Hebrew characters (more reliable)
-            if debug:
-                print(f"  [DEBUG] Sending Hebrew char '{char}' via pynput")
-            keyboard.type(char)
+        if hebrew:
+            if send_unicode_input is not None:
+                if debug:
+                    print(f"  [DEBUG] Sending Hebrew text '{text}' via SendInput")
+                send_hebrew = send_unicode_input
+            else:
+                # Use pynput for Hebrew text (more reliable)
+                if debug:
+                    print(f"  [DEBUG] Sending Hebrew text '{text}' via pynput")
+                send_hebrew = keyboard.type
+            if char_interval > 0:
+                for i, char in enumerate(text):
+                    if i:
+                        time.sleep(char_interval)
+                    send_hebrew(char)
+            else:
+                send_hebrew(text)
             return True
         else:
-            # Use pyautogui for ASCII characters
+            # Use pyautogui for ASCII text
             if debug:
-                print(f"  [DEBUG] Sending ASCII char '{char}' via pyautogui")
-            pyautogui.write(char)
+                print(f"  [DEBUG] Sending ASCII text '{text}' via pyautogui")
+            pyautogui.write(text, interval=char_interval)
             return True
     except Exception as e:
         if debug:
-            print(f"  [ERROR] Failed to send char '{char}': {e}")
+            print(f"  [ERROR] Failed to send text '{text}': {e}")
         return False
 
-def send_command(cmd, key_delay=0.05, post_delay=0.3, debug=False):
+def send_command(cmd, key_delay=0.05, post_delay=0.3, debug=False, tokens=None,
+                 char_interval=0.0):
     """
     Send a command string with support for special keys and Hebrew text.
     
     Special key format: {ENTER}, {F5}, {ESC}, etc.
+    Plain text is sent one run at a time, with char_interval seconds between
+    its characters; key_delay is slept after each text run or special key.
+    tokens may be passed in if the command was already tokenized.
     """
+    import_gui_modules()
+    
     if debug:
         print(f"  [DEBUG] Processing command: '{cmd}'")
     
-    i = 0
-    while i < len(cmd):
-        if cmd[i] == '{':
-            # Look for closing brace
-            close_idx = cmd.find('}', i)
-            if close_idx > i:
-                # Found special key sequence
-                special_key = cmd[i+1:close_idx].upper()
-                if debug:
-                    print(f"  [DEBUG] Sending special key: {special_key}")
-                
-                # Handle special keys with pynput for better compatibility
-                if special_key in ['ENTER', 'RETURN']:
-                    try:
-                        keyboard.press(Key.enter)
-                        keyboard.release(Key.enter)
-                        if debug:
-                            print(f"  [DEBUG] ENTER sent via pynput")
-                    except Exception as e:
-                        print(f"  [ERROR] Failed to send ENTER: {e}")
-                elif special_key == 'ESC' or special_key == 'ESCAPE':
-                    try:
-                        keyboard.press(Key.esc)
-                        keyboard.release(Key.esc)
-                        if debug:
-                            print(f"  [DEBUG] ESC sent via pynput")
-                    except Exception as e:
-                        print(f"  [ERROR] Failed to send ESC: {e}")
-                elif special_key == 'TAB':
-                    try:
-                        keyboard.press(Key.tab)
-                        keyboard.release(Key.tab)
-                        if debug:
-                            print(f"  [DEBUG] TAB sent via pynput")
-                    except Exception as e:
-                        print(f"  [ERROR] Failed to send TAB: {e}")
-                elif special_key == 'SPACE':
-                    try:
-                        keyboard.press(Key.space)
-                        keyboard.release(Key.space)
-                        if debug:
-                            print(f"  [DEBUG] SPACE sent via pynput")
-                    except Exception as e:
-                        print(f"  [ERROR] Failed to send SPACE: {e}")
-                else:
-                    # Fall back to pyautogui for other special keys
-                    key_map = {
-                        'BACKSPACE': 'backspace',
-                        'DELETE': 'delete',
-                        'HOME': 'home',
-                        'END': 'end',
-                        'PGUP': 'pageup',
-                        'PGDN': 'pagedown',
-                        'UP': 'up',
-                        'DOWN': 'down',
-                        'LEFT': 'left',
-                        'RIGHT': 'right',
-                        'F1': 'f1', 'F2': 'f2', 'F3': 'f3', 'F4': 'f4',
-                        'F5': 'f5', 'F6': 'f6', 'F7': 'f7', 'F8': 'f8',
-                        'F9': 'f9', 'F10': 'f10', 'F11': 'f11', 'F12': 'f12'
-                    }
-                    
-                    if special_key in key_map:
-                        try:
-                            pyautogui.press(key_map[special_key])
-                            if debug:
-                                print(f"  [DEBUG] Special key '{special_key}' sent via pyautogui")
-                        except Exception as e:
-                            print(f"  [ERROR] Failed to send special key '{special_key}': {e}")
-                    else:
-                        print(f"  [WARNING] Unknown special key: {special_key}")
-                
-                i = close_idx + 1
-                time.sleep(key_delay)
-            else:
-                # No closing brace, treat as literal
-                send_char_safe(cmd[i], debug)
-                i += 1
-                time.sleep(key_delay)
+    if tokens is None:
+        tokens = tokenize_command(cmd)
+    
+    for kind, value in tokens:
+        if kind != 'key':
+            send_text_safe(value, kind == 'hebrew', debug, char_interval)
         else:
-            # Regular character - use appropriate method based on character type
-            send_char_safe(cmd[i], debug)
-            i += 1
-            time.sleep(key_delay / 10)  # Faster for regular chars
+            special_key = value
+            if debug:
+                print(f"  [DEBUG] Sending special key: {special_key}")
+            key = SPECIAL_KEYS.get(special_key)
+            if key is None:
+                print(f"  [WARNING] Unknown special key: {special_key}")
+            else:
+                try:
+                    keyboard.press(key)
+                    keyboard.release(key)
+                    if debug:
+                        print(f"  [DEBUG] {special_key} sent via pynput")
+                except Exception as e:
+                    print(f"  [ERROR] Failed to send {special_key}: {e}")
+            
+        time.sleep(key_delay)
     
     # Add automatic ENTER if command doesn't end with a special key
     if not cmd.rstrip().endswith('}'):
@@ -198,7 +285,9 @@ def main():
     parser.add_argument('-s', '--start', type=int, default=1,
                        help='Start from line number when reading from file (1-based)')
     parser.add_argument('--key-delay', type=float, default=0.15,
-                       help='Delay between keystrokes (seconds)')
+                       help='Delay after each text run or {KEY} token (seconds)')
+    parser.add_argument('--char-interval', type=float, default=0.0,
+                       help='Delay between characters within a text run (seconds; 0 sends each run at once)')
     parser.add_argument('--command-delay', type=float, default=0.3,
                        help='Delay after each command (seconds)')
     parser.add_argument('--dry-run', action='store_true',
@@ -216,6 +305,7 @@ def main():
         return
     
     if args.list_windows:
+        import_window_module()
         print("All visible windows:")
         for window in gw.getAllWindows():
             if window.title.strip():
@@ -264,6 +354,19 @@ def main():
         print("No commands provided. Use -c or -f option.")
         return
     
+    if args.dry_run:
+        print(f"DRY RUN - Would send {len(commands)} command(s):")
+        start_num = file_start_line if args.file else 1
+        for i, cmd in enumerate(commands):
+            line_num = start_num + i
+            print(f"  {line_num:03d}: {cmd}")
+        return
+    
+    # Tokenize every command up front, so the send loop only replays tokens
+    command_tokens = [tokenize_command(cmd) for cmd in commands]
+    
+    import_gui_modules()
+    
     # Find target window
     windows = find_window_by_title(args.window_title)
     if not windows:
@@ -279,14 +382,6 @@ def main():
     target_window = windows[0]
     print(f"Target window: '{target_window.title}'")
     
-    if args.dry_run:
-        print(f"DRY RUN - Would send {len(commands)} command(s):")
-        start_num = file_start_line if args.file else 1
-        for i, cmd in enumerate(commands):
-            line_num = start_num + i
-            print(f"  {line_num:03d}: {cmd}")
-        return
-    
     # Activate window
     if not activate_window(target_window):
         print("Failed to activate target window")
@@ -297,15 +392,17 @@ def main():
     
     # Send commands
     start_num = file_start_line if args.file else 1
-    for i, cmd in enumerate(commands):
+    for i, (cmd, tokens) in enumerate(zip(commands, command_tokens)):
         line_num = start_num + i
         print(f"{line_num:03d}: {cmd}")
         
-        # Re-activate window before each command (in case focus was lost)
-        activate_window(target_window)
+        # Re-activate window only if it lost the focus
+        if not is_active_window(target_window):
+            activate_window(target_window)
         
         try:
-            send_command(cmd, args.key_delay, args.command_delay, args.debug)
+            send_command(cmd, args.key_delay, args.command_delay, args.debug, tokens,
+                         args.char_interval)
         except pyautogui.FailSafeException:
             print("Aborted by moving mouse to corner")
             break
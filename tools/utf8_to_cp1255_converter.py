@@ -9,9 +9,59 @@ UTF-8 uses 2 bytes per Hebrew character, CP1255 uses 1 byte per Hebrew character
 import os
 import sys
 import argparse
+import codecs
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def convert_file_utf8_to_cp1255(input_file, output_file=None):
+# Files at least this large are transcoded in chunks rather than in memory
+STREAM_MIN_SIZE = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# CP1255 encoder, looked up once instead of by name on every encode
+CP1255_ENCODE = codecs.lookup('cp1255').encode
+
+# str.translate table that deletes the Hebrew Unicode block (U+0590-U+05FF)
+HEBREW_DELETE_TABLE = dict.fromkeys(range(0x0590, 0x0600))
+
+def count_hebrew_chars(text):
+    """Count characters in the Hebrew Unicode block."""
+    return len(text) - len(text.translate(HEBREW_DELETE_TABLE))
+
+def transcode_file_streaming(input_file, output_file):
+    """
+    Transcode a UTF-8 file to CP1255 in chunks, so memory use stays bounded.
+    
+    The output goes to a temporary file that replaces output_file only once
+    the whole input converted, so a failure never leaves a partial file.
+    
+    Returns:
+        tuple: (character_count, hebrew_char_count, cp1255_size)
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    encoder = codecs.getincrementalencoder('cp1255')()
+    char_count = hebrew_chars = cp1255_size = 0
+    tmp_file = f"{output_file}.tmp"
+    try:
+        with open(input_file, 'rb') as src, open(tmp_file, 'wb') as dst:
+            while True:
+                chunk = src.read(STREAM_CHUNK_SIZE)
+                final = not chunk
+                text = decoder.decode(chunk, final)
+                char_count += len(text)
+                hebrew_chars += count_hebrew_chars(text)
+                encoded = encoder.encode(text, final)
+                dst.write(encoded)
+                cp1255_size += len(encoded)
+                if final:
+                    break
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return char_count, hebrew_chars, cp1255_size
+
+def convert_file_utf8_to_cp1255(input_file, output_file=None, log=print):
     """
     Convert a single file from UTF-8 to CP1255 encoding.
     
@@ -19,60 +69,78 @@ def convert_file_utf8_to_cp1255(input_file, output_file=None):
         input_file (str): Path to the input UTF-8 file
         output_file (str, optional): Path to the output CP1255 file. 
                                    If None, will overwrite the input file.
+        log (callable, optional): Called with each report line (default: print)
     
     Returns:
         bool: True if conversion successful, False otherwise
     """
     
+    def log_input_info(utf8_size, char_count, hebrew_chars):
+        log(f"📖 Reading UTF-8 file: {input_file}")
+        log(f"   File size (UTF-8): {utf8_size} bytes")
+        log(f"   Characters read: {char_count}")
+        log(f"   Hebrew characters: {hebrew_chars}")
+    
     try:
-        # Read the file as UTF-8
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        print(f"📖 Reading UTF-8 file: {input_file}")
-        print(f"   File size (UTF-8): {os.path.getsize(input_file)} bytes")
-        print(f"   Characters read: {len(content)}")
-        
-        # Count Hebrew characters (for information)
-        hebrew_chars = 0
-        for char in content:
-            if '\u0590' <= char <= '\u05FF':  # Hebrew Unicode block
-                hebrew_chars += 1
-        
-        print(f"   Hebrew characters: {hebrew_chars}")
-        
         # Set output file path
         if output_file is None:
             output_file = input_file
         
-        # Write the content as CP1255
-        with open(output_file, 'w', encoding='cp1255') as f:
-            f.write(content)
+        utf8_size = os.path.getsize(input_file)
+        
+        if utf8_size >= STREAM_MIN_SIZE:
+            # Large file: transcode it in chunks instead of holding it in memory
+            char_count, hebrew_chars, cp1255_size = transcode_file_streaming(input_file, output_file)
+            log_input_info(utf8_size, char_count, hebrew_chars)
+        else:
+            # Read the raw bytes and transcode them in one step
+            raw = Path(input_file).read_bytes()
+            # ASCII is encoded the same way in UTF-8 and CP1255, so a pure-ASCII
+            # file needs no decoding or encoding at all
+            is_ascii = raw.isascii()
+            # A UTF-8 BOM has no CP1255 equivalent, so it is dropped
+            content = None if is_ascii else raw.decode('utf-8-sig')
+            
+            # Count Hebrew characters (for information)
+            if is_ascii:
+                log_input_info(len(raw), len(raw), 0)
+            else:
+                log_input_info(len(raw), len(content), count_hebrew_chars(content))
+            
+            # Encode before opening the output, so an unsupported character
+            # doesn't leave a truncated file behind
+            encoded = raw if is_ascii else CP1255_ENCODE(content, 'strict')[0]
+            
+            # Write the content as CP1255 (an ASCII file converted in place
+            # already is CP1255)
+            if not (is_ascii and output_file == input_file):
+                Path(output_file).write_bytes(encoded)
+            
+            utf8_size = len(raw)
+            cp1255_size = len(encoded)
         
-        print(f"💾 Writing CP1255 file: {output_file}")
-        print(f"   File size (CP1255): {os.path.getsize(output_file)} bytes")
+        log(f"💾 Writing CP1255 file: {output_file}")
+        log(f"   File size (CP1255): {cp1255_size} bytes")
         
         # Calculate size difference
-        utf8_size = len(content.encode('utf-8'))
-        cp1255_size = len(content.encode('cp1255'))
         size_reduction = utf8_size - cp1255_size
         
-        print(f"   Size reduction: {size_reduction} bytes ({size_reduction/utf8_size*100:.1f}%)")
-        print(f"✅ Conversion successful!")
+        log(f"   Size reduction: {size_reduction} bytes ({size_reduction/utf8_size*100:.1f}%)")
+        log(f"✅ Conversion successful!")
         
         return True
         
     except UnicodeDecodeError as e:
-        print(f"❌ Error: Input file is not valid UTF-8: {e}")
+        log(f"❌ Error: Input file is not valid UTF-8: {e}")
         return False
     except UnicodeEncodeError as e:
-        print(f"❌ Error: Cannot encode to CP1255 (unsupported characters): {e}")
+        log(f"❌ Error: Cannot encode to CP1255 (unsupported characters): {e}")
         return False
     except FileNotFoundError:
-        print(f"❌ Error: Input file not found: {input_file}")
+        log(f"❌ Error: Input file not found: {input_file}")
         return False
     except Exception as e:
-        print(f"❌ Error converting file: {e}")
+        log(f"❌ Error converting file: {e}")
         return False
 
 def convert_directory_utf8_to_cp1255(input_dir, output_dir=None, pattern="*.txt"):
@@ -108,24 +176,36 @@ def convert_directory_utf8_to_cp1255(input_dir, output_dir=None, pattern="*.txt"
     print(f"🔍 Found {len(files)} files matching pattern '{pattern}'")
     print("=" * 60)
     
-    successful_count = 0
+    if output_dir:
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
     
-    for file_path in files:
-        print(f"\nProcessing: {file_path.name}")
-        
+    def convert_one(file_path):
         # Determine output file path
         if output_dir:
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
-            output_file = output_path / file_path.name
+            output_file = str(output_path / file_path.name)
         else:
             output_file = None  # Overwrite original
         
-        # Convert the file
-        if convert_file_utf8_to_cp1255(str(file_path), str(output_file) if output_file else None):
-            successful_count += 1
-        
-        print("-" * 40)
+        # Collect the report instead of printing it, so the output of
+        # files converted in parallel doesn't interleave
+        report = []
+        success = convert_file_utf8_to_cp1255(str(file_path), output_file, log=report.append)
+        return success, report
+    
+    successful_count = 0
+    
+    # Files are independent and the work is mostly I/O, so convert them on a
+    # thread pool; map() keeps the reports in file order
+    with ThreadPoolExecutor() as executor:
+        for file_path, (success, report) in zip(files, executor.map(convert_one, files)):
+            print(f"\nProcessing: {file_path.name}")
+            for line in report:
+                print(line)
+            if success:
+                successful_count += 1
+            
+            print("-" * 40)
     
     print(f"\n✅ Directory conversion complete!")
     print(f"   Files processed: {len(files)}")
@@ -146,22 +226,26 @@ def show_file_encoding_info(file_path):
     print("-" * 50)
     
     try:
-        # Try to read as UTF-8
+        # Read the file once and try both decodings on the same bytes
+        raw = Path(file_path).read_bytes()
+        
+        # Try to decode as UTF-8
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                utf8_content = f.read()
+            utf8_content = raw.decode('utf-8-sig')
             print(f"✅ UTF-8 readable: {len(utf8_content)} characters")
+            if raw.startswith(codecs.BOM_UTF8):
+                print(f"   UTF-8 BOM: yes (dropped when converting)")
             
             # Count Hebrew characters
-            hebrew_chars = sum(1 for char in utf8_content if '\u0590' <= char <= '\u05FF')
+            hebrew_chars = count_hebrew_chars(utf8_content)
             print(f"   Hebrew characters: {hebrew_chars}")
             
             # Calculate byte sizes
-            utf8_bytes = len(utf8_content.encode('utf-8'))
+            utf8_bytes = len(raw)
             print(f"   UTF-8 size: {utf8_bytes} bytes")
             
             try:
-                cp1255_bytes = len(utf8_content.encode('cp1255'))
+                cp1255_bytes = len(CP1255_ENCODE(utf8_content, 'strict')[0])
                 print(f"   CP1255 size: {cp1255_bytes} bytes")
                 print(f"   Size difference: {utf8_bytes - cp1255_bytes} bytes")
             except UnicodeEncodeError:
@@ -170,17 +254,15 @@ def show_file_encoding_info(file_path):
         except UnicodeDecodeError:
             print(f"❌ File is not valid UTF-8")
         
-        # Try to read as CP1255
+        # Try to decode as CP1255
         try:
-            with open(file_path, 'r', encoding='cp1255') as f:
-                cp1255_content = f.read()
+            cp1255_content = raw.decode('cp1255')
             print(f"✅ CP1255 readable: {len(cp1255_content)} characters")
         except UnicodeDecodeError:
             print(f"❌ File is not valid CP1255")
         
         # Show actual file size
-        file_size = os.path.getsize(file_path)
-        print(f"📁 Actual file size: {file_size} bytes")
+        print(f"📁 Actual file size: {len(raw)} bytes")
         
     except FileNotFoundError:
         print(f"❌ File not found: {file_path}")
@@ -10,32 +10,35 @@ from pathlib import Path
 
 
 def load_file_data(file_path):
-    """Load file data into a dictionary with index as key and text as value."""
-    data = {}
+    """
+    Load file data into two aligned lists, indices and texts, ordered by index.
+    
+    If an index appears more than once, the last line wins.
+    """
+    indices = []
+    texts = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if '|' not in line:
-                    print(f"Warning: Line {line_num} in {file_path} has no '|' separator: {line}")
-                    continue
-                
-                parts = line.split('|', 1)
-                if len(parts) != 2:
-                    print(f"Warning: Line {line_num} in {file_path} malformed: {line}")
-                    continue
+        # Decode the whole file at once and split it ourselves instead of
+        # going through the text-mode line iterator
+        lines = Path(file_path).read_bytes().decode('utf-8').split('\n')
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            
+            index_str, sep, text = line.partition('|')
+            if not sep:
+                print(f"Warning: Line {line_num} in {file_path} has no '|' separator: {line}")
+                continue
+            
+            try:
+                index = int(index_str)
+            except ValueError:
+                print(f"Warning: Line {line_num} in {file_path} has invalid index: {index_str}")
+                continue
+            indices.append(index)
+            texts.append(text)
                 
-                try:
-                    index = int(parts[0])
-                    text = parts[1]
-                    data[index] = text
-                except ValueError:
-                    print(f"Warning: Line {line_num} in {file_path} has invalid index: {parts[0]}")
-                    continue
-                    
     except FileNotFoundError:
         print(f"Error: File not found: {file_path}")
         sys.exit(1)
@@ -44,51 +47,80 @@ def load_file_data(file_path):
         print(f"Error reading {file_path}: {e}")
         sys.exit(1)
     
-    return data
+    # Files are normally written in index order, so only sort (and drop
+    # duplicate indices) when they aren't
+    if any(prev >= cur for prev, cur in zip(indices, indices[1:])):
+        data = dict(zip(indices, texts))
+        indices = sorted(data)
+        texts = [data[index] for index in indices]
+    
+    return indices, texts
 
 
-def verify_translation_lengths(english_file, hebrew_file, output_file=None):
+def compare_by_index(english_indices, english_texts, hebrew_indices, hebrew_texts):
     """
-    Verify that Hebrew translations are not longer than English text.
-    
-    Args:
-        english_file: Path to English text file
-        hebrew_file: Path to Hebrew text file  
-        output_file: Optional path to write results to
+    Compare entries matched up by index, warning about entries missing on either side.
     
     Returns:
         List of violations (index, eng_len, heb_len, eng_text, heb_text)
     """
-    print(f"Loading English file: {english_file}")
-    english_data = load_file_data(english_file)
-    
-    print(f"Loading Hebrew file: {hebrew_file}")
-    hebrew_data = load_file_data(hebrew_file)
-    
-    print(f"English entries: {len(english_data)}")
-    print(f"Hebrew entries: {len(hebrew_data)}")
-    
+    hebrew_data = dict(zip(hebrew_indices, hebrew_texts))
     violations = []
     
     # Check all English entries for corresponding Hebrew translations
-    for index in sorted(english_data.keys()):
-        english_text = english_data[index]
+    for index, english_text in zip(english_indices, english_texts):
         english_len = len(english_text)
         
-        if index not in hebrew_data:
+        hebrew_text = hebrew_data.get(index)
+        if hebrew_text is None:
             print(f"Warning: Missing Hebrew translation for index {index}")
             continue
             
-        hebrew_text = hebrew_data[index]
         hebrew_len = len(hebrew_text)
         if hebrew_len > english_len:
             violations.append((index, english_len, hebrew_len, english_text, hebrew_text))
     
     # Check for Hebrew entries without English counterpart
-    for index in sorted(hebrew_data.keys()):
-        if index not in english_data:
+    english_index_set = set(english_indices)
+    for index in hebrew_indices:
+        if index not in english_index_set:
             print(f"Warning: Hebrew entry {index} has no English counterpart")
     
+    return violations
+
+
+def verify_translation_lengths(english_file, hebrew_file, output_file=None):
+    """
+    Verify that Hebrew translations are not longer than English text.
+    
+    Args:
+        english_file: Path to English text file
+        hebrew_file: Path to Hebrew text file  
+        output_file: Optional path to write results to
+    
+    Returns:
+        List of violations (index, eng_len, heb_len, eng_text, heb_text)
+    """
+    print(f"Loading English file: {english_file}")
+    english_indices, english_texts = load_file_data(english_file)
+    
+    print(f"Loading Hebrew file: {hebrew_file}")
+    hebrew_indices, hebrew_texts = load_file_data(hebrew_file)
+    
+    print(f"English entries: {len(english_indices)}")
+    print(f"Hebrew entries: {len(hebrew_indices)}")
+    
+    if english_indices == hebrew_indices:
+        # Both files cover the same indices (the usual case), so the rows
+        # line up and can be compared pairwise without any lookups
+        violations = [
+            (index, len(english_text), len(hebrew_text), english_text, hebrew_text)
+            for index, english_text, hebrew_text in zip(english_indices, english_texts, hebrew_texts)
+            if len(hebrew_text) > len(english_text)
+        ]
+    else:
+        violations = compare_by_index(english_indices, english_texts, hebrew_indices, hebrew_texts)
+    
     # Output results
     output_lines = []
     